@@ -2,36 +2,223 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
 import json
+import logging
 import os
 import sys
 import webbrowser
-from io import StringIO
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-import queue
+from contextlib import redirect_stdout, redirect_stderr
+from collections import deque
+from types import SimpleNamespace
+from typing import Optional, Deque, Dict, List, Any
 import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import re
 
-# Import existing agent dependencies
+# python-dotenv is cheap and needed before anything else; the heavy
+# LLM/agent imports (langchain_google_genai pulls in google-api-core,
+# protobuf and grpc) are deferred to first use so they never block the
+# first window paint.
 try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from windows_use.agent import Agent
     from dotenv import load_dotenv
-    DEPENDENCIES_AVAILABLE = True
+    # Load environment variables once at import; .env is not re-parsed afterwards
+    load_dotenv()
 except ImportError:
-    DEPENDENCIES_AVAILABLE = False
+    load_dotenv = None
+
+# orjson serializes at C speed (~5-10x stdlib json); fall back to the
+# stdlib when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Resolved lazily by dependencies_available(); None means "not probed yet"
+DEPENDENCIES_AVAILABLE = None
+
+
+def dependencies_available() -> bool:
+    """Probe for the agent dependencies, importing them on first call only."""
+    global DEPENDENCIES_AVAILABLE
+    if DEPENDENCIES_AVAILABLE is None:
+        try:
+            import langchain_google_genai  # noqa: F401
+            import windows_use.agent  # noqa: F401
+            DEPENDENCIES_AVAILABLE = load_dotenv is not None
+        except ImportError:
+            DEPENDENCIES_AVAILABLE = False
+    return DEPENDENCIES_AVAILABLE
+
+# Compiled once at import: langchain/agent output is scrubbed per line, so
+# going through re.sub's per-call cache lookup would add up on verbose runs.
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Classifies a log line in one C-level scan; the matched group name selects
+# the emoji prefix shown in the chat display. Only the error/warning
+# alternatives are case-insensitive, matching the old .upper() checks.
+_LOG_RE = re.compile(
+    r"(?P<iteration>Iteration)|(?P<evaluate>Evaluate)|(?P<memory>Memory)|"
+    r"(?P<thought>Thought)|(?P<action>Action)|(?P<observation>Observation)|"
+    r"(?P<final>Final Answer)|(?P<error>(?i:ERROR|EXCEPTION))|(?P<warning>(?i:WARNING))")
+
+_LOG_EMOJI = {
+    'iteration': "🔄",
+    'evaluate': "🔍",
+    'memory': "🧠",
+    'thought': "💭",
+    'action': "⚡",
+    'observation': "👁️",
+    'final': "✅",
+    'error': "❌",
+    'warning': "⚠️",
+}
+
+
+# Most log lines begin with their marker, so a prefix check resolves them in
+# O(prefix) before falling back to the full-line regex scan
+_LOG_PREFIXES = (
+    ("Iteration", "🔄"),
+    ("Evaluate", "🔍"),
+    ("Memory", "🧠"),
+    ("Thought", "💭"),
+    ("Action", "⚡"),
+    ("Observation", "👁️"),
+    ("Final Answer", "✅"),
+)
+
+
+def _format_agent_log(line):
+    """Format an agent log line for GUI display, or None if it is empty."""
+    line = _ANSI_RE.sub("", line).strip()
+    if not line:
+        return None
+    for prefix, emoji in _LOG_PREFIXES:
+        if line.startswith(prefix):
+            return f"{emoji} {line}"
+    match = _LOG_RE.search(line)
+    if match:
+        return f"{_LOG_EMOJI[match.lastgroup]} {line}"
+    # Return other agent output as-is
+    return line
+
+
+class MPSCRing:
+    """
+    Fixed-capacity multi-producer/single-consumer ring buffer.
+
+    Producers are not one thread: the agent executor, the asyncio loop
+    thread, and whatever thread a library log record is emitted on all
+    push, so a small lock serializes the tail update. The single consumer
+    (the Tk main loop) stays lock-free — it only ever writes the head
+    index. The indices grow monotonically and are reduced into the buffer
+    on access, so `tail - head` is always the number of queued items.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        # Power-of-two capacity lets indices be reduced with a bitmask
+        # instead of the much slower modulo on the per-message path
+        assert capacity > 0 and capacity & (capacity - 1) == 0, \
+            "capacity must be a power of two"
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._buf = [None] * capacity
+        # Single-element lists so index updates are single bytecode stores
+        # visible across threads; head is consumer-owned, tail lock-guarded.
+        self._head = [0]
+        self._tail = [0]
+        self._push_lock = threading.Lock()
+
+    def push(self, item) -> bool:
+        """Producer side: enqueue item, dropping it if the ring is full."""
+        with self._push_lock:
+            t = self._tail[0]
+            if t - self._head[0] == self._capacity:
+                return False
+            self._buf[t & self._mask] = item
+            self._tail[0] = t + 1
+        return True
+
+    def pop(self):
+        """Consumer side: dequeue one item, or None if the ring is empty."""
+        h = self._head[0]
+        if h == self._tail[0]:
+            return None
+        idx = h & self._mask
+        item = self._buf[idx]
+        self._buf[idx] = None  # Release the reference for GC
+        self._head[0] = h + 1
+        return item
+
+    def __len__(self):
+        return self._tail[0] - self._head[0]
+
+
+class _RingHandler(logging.Handler):
+    """
+    Logging handler that posts formatted records straight into the GUI
+    message pump, so logger-based agent output reaches the chat display
+    without any stdout interception.
+    """
+
+    def __init__(self, post):
+        super().__init__()
+        self.post = post
+
+    def emit(self, record):
+        try:
+            self.post("Agent", self.format(record), "agent")
+        except Exception:
+            self.handleError(record)
 
-# Load environment variables
-load_dotenv()
 
 class WindowsAgentGUI:
     """
     Modern GUI application for Windows Agent using tkinter.
     Provides a professional interface while preserving all original agent functionality.
     """
-    
+
+    # Line-delimited JSON history logs; entries are appended as they happen
+    # and the files are compacted from memory on shutdown
+    CHAT_HISTORY_FILE = "chat_history.jsonl"
+    TASK_HISTORY_FILE = "task_history.jsonl"
+    MAX_CHAT_LOG_ENTRIES = 2000
+    MAX_TASK_LOG_ENTRIES = 200
+    HISTORY_FLUSH_MS = 5000
+
+    # Developer website opened from the footer link
+    MACHOVOTRISH_URL = "https://www.machovotrish.com"
+
+    # Suggestion cards shown in the main panel: (icon, title, description)
+    COMMAND_CARDS = (
+        ("🔵", "Commands", "Go to youtube and play song beat it."),
+        ("🟡", "Commands", "Go to microsoft word and write a short 20 word summary on agi."),
+        ("🟠", "Commands", "Go to microsoft copilot and ask what is agi."),
+    )
+
+    # Shared theme palette; class-level so it is allocated once, and
+    # attribute access skips the dict __getitem__ dispatch at the hundreds
+    # of widget-config sites below
+    COLORS = SimpleNamespace(
+        bg='#f8f9fa',
+        fg='#333333',
+        sidebar_bg='#ffffff',
+        button_bg='#f1f3f4',
+        entry_bg='#ffffff',
+        text_bg='#ffffff',
+        green='#28a745',
+        red='#dc3545',
+        gray='#6c757d',
+        blue='#007bff',
+        selected_bg='#e8e8e8',
+        card_bg='#ffffff',
+        border='#e0e0e0',
+        # Hover colors for buttons
+        green_hover='#218838',
+        red_hover='#c82333',
+        gray_hover='#5a6268',
+        blue_hover='#0056b3'
+    )
+
     def __init__(self):
         # Main window setup
         self.root = tk.Tk()
@@ -39,66 +226,83 @@ class WindowsAgentGUI:
         self.root.geometry("1200x800")
         self.root.minsize(1000, 700)
         
-        # Configure dark theme colors
-        self.colors = {
-            'bg': '#f8f9fa',
-            'fg': '#333333',
-            'sidebar_bg': '#ffffff',
-            'button_bg': '#f1f3f4',
-            'entry_bg': '#ffffff',
-            'text_bg': '#ffffff',
-            'green': '#28a745',
-            'red': '#dc3545',
-            'gray': '#6c757d',
-            'blue': '#007bff',
-            'selected_bg': '#e8e8e8',
-            'card_bg': '#ffffff',
-            'border': '#e0e0e0',
-            # Hover colors for buttons
-            'green_hover': '#218838',
-            'red_hover': '#c82333',
-            'gray_hover': '#5a6268',
-            'blue_hover': '#0056b3'
-        }
-        
         # Configure root window
-        self.root.configure(bg=self.colors['bg'])
+        self.root.configure(bg=self.COLORS.bg)
         
-        # Application state
-        self.agent: Optional[Agent] = None
-        self.llm: Optional[ChatGoogleGenerativeAI] = None
+        # Application state (agent/llm types are imported lazily)
+        self.agent = None
+        self.llm = None
         self.current_api_key: str = ""  # Store API key in memory
         self.is_task_running = False
-        self.current_task: Optional[asyncio.Task] = None
-        self.task_thread: Optional[threading.Thread] = None
-        self.message_queue = queue.Queue()
-        
-        # Chat history and settings
-        self.chat_history: List[Dict[str, Any]] = []
-        self.task_history: List[str] = []
+        self.current_task = None  # concurrent.futures.Future for the running task
+        self.message_queue = MPSCRing()
+
+        # One background event loop serves all agent tasks for the app
+        # lifetime; coroutines are dispatched onto it from the Tk thread
+        # with asyncio.run_coroutine_threadsafe.
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run_agent_loop, name="agent-loop", daemon=True).start()
+
+        # One worker thread runs every blocking agent.invoke; pooling it
+        # avoids paying executor spin-up/teardown per task
+        self._agent_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent")
+
+        # Set by stop_task; the capture writer checks it so a running
+        # agent.invoke unwinds at its next output instead of running on
+        self._cancel_event = threading.Event()
+        
+        # Chat history and settings; bounded deques evict the oldest entry
+        # in O(1) instead of growing without limit
+        self.chat_history: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_CHAT_LOG_ENTRIES)
+        self.task_history: Deque[str] = deque(maxlen=self.MAX_TASK_LOG_ENTRIES)
         self.settings = self.load_settings()
         
-        # Agent output capture
-        self.original_stdout = sys.stdout
-        self.original_stderr = sys.stderr
-        
+        # Logging handler feeding agent/library log records into the ring;
+        # installed on first agent initialization
+        self._ring_handler = None
+
+        # Timestamp memo: message timestamps have 1s resolution, so the
+        # formatted string is reused within the same second
+        self._ts_sec = 0
+        self._ts_str = ""
+
         # GUI components
         self.setup_gui()
         self.load_chat_history()
         self.load_task_history()
-        
-        # Initialize agent if dependencies are available
-        if DEPENDENCIES_AVAILABLE:
-            self.load_api_key_from_env()
-            # Load rules from .env on startup
-            self.settings["rules"] = self.load_rules()
-        
-        # Start message processing
-        self.process_message_queue()
+
+        # Append-only history logs (one JSON document per line); opened once
+        # so each new entry costs a single buffered line write, not a full
+        # rewrite. The buffers are flushed on a timer rather than per line,
+        # keeping kernel I/O off the per-message path.
+        self._chat_file = open(self.CHAT_HISTORY_FILE, "a", encoding="utf-8", buffering=8192)
+        self._task_file = open(self.TASK_HISTORY_FILE, "a", encoding="utf-8", buffering=8192)
+        self.root.after(self.HISTORY_FLUSH_MS, self._flush_history_logs)
+        
+        # Key and rules only touch os.environ and rules.json, so they load
+        # without probing the heavy agent dependencies
+        self.load_api_key_from_env()
+        self.settings["rules"] = self.load_rules()
+        self._rebuild_rules_prefix()
+        
+        # Message pump: producers wake the consumer with a virtual event,
+        # so the main thread parks completely while the app is idle
+        self._drain_pending = False
+        self.root.bind("<<AgentLog>>", self._on_agent_log_event)
         
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
+    def _run_agent_loop(self):
+        """
+        Body of the persistent agent event-loop thread.
+
+        The loop is registered as this thread's current loop so library code
+        calling asyncio.get_event_loop from inside a task finds it.
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
     def setup_gui(self):
         """
         Create and configure all GUI components with proper layout and styling.
@@ -108,31 +312,65 @@ class WindowsAgentGUI:
         self.root.grid_columnconfigure(0, weight=1)  # Sidebar gets less space
         self.root.grid_rowconfigure(0, weight=1)
         
+        # Shared button styles must exist before any button is created
+        self._init_button_styles()
+
         # Create main containers
         self.create_sidebar()
         self.create_main_panel()
         self.create_settings_panel()
+
+    def _init_button_styles(self):
+        """
+        Define shared ttk button styles with hover and disabled color maps.
+
+        Hover feedback is drawn by Tk itself through the style map, so no
+        Python-level <Enter>/<Leave> callbacks fire on mouse crossings.
+        """
+        style = ttk.Style(self.root)
+        style.theme_use('clam')
+
+        for name, base, hover in (
+            ('Green.TButton', self.COLORS.green, self.COLORS.green_hover),
+            ('Red.TButton', self.COLORS.red, self.COLORS.red_hover),
+            ('Gray.TButton', self.COLORS.gray, self.COLORS.gray_hover),
+            ('Blue.TButton', self.COLORS.blue, self.COLORS.blue_hover),
+        ):
+            style.configure(
+                name,
+                background=base,
+                foreground='white',
+                borderwidth=0,
+                focusthickness=0,
+                font=("Arial", 11, "bold"),
+                padding=8
+            )
+            style.map(
+                name,
+                background=[('disabled', self.COLORS.button_bg), ('active', hover), ('!active', base)],
+                foreground=[('disabled', self.COLORS.gray)]
+            )
     
     def create_sidebar(self):
         """
         Create left sidebar with edit icon, history, and control buttons.
         """
         # Sidebar frame
-        self.sidebar_frame = tk.Frame(self.root, bg=self.colors['sidebar_bg'], width=280, relief='solid', borderwidth=1)
+        self.sidebar_frame = tk.Frame(self.root, bg=self.COLORS.sidebar_bg, width=280, relief='solid', borderwidth=1)
         self.sidebar_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 2))
         self.sidebar_frame.grid_rowconfigure(2, weight=1)  # Task history expands
         self.sidebar_frame.grid_columnconfigure(0, weight=1)
         
         # Header with edit icon
-        header_frame = tk.Frame(self.sidebar_frame, bg=self.colors['sidebar_bg'])
+        header_frame = tk.Frame(self.sidebar_frame, bg=self.COLORS.sidebar_bg)
         header_frame.grid(row=0, column=0, sticky="ew", padx=20, pady=(20, 10))
         
         edit_icon = tk.Label(
             header_frame,
             text="✏️",
             font=("Arial", 16),
-            bg=self.colors['sidebar_bg'],
-            fg=self.colors['fg'],
+            bg=self.COLORS.sidebar_bg,
+            fg=self.COLORS.fg,
             cursor='hand2'
         )
         edit_icon.pack(anchor="w")
@@ -142,23 +380,23 @@ class WindowsAgentGUI:
             self.sidebar_frame, 
             text="HISTORY", 
             font=("Arial", 10, "bold"),
-            bg=self.colors['sidebar_bg'],
-            fg=self.colors['gray']
+            bg=self.COLORS.sidebar_bg,
+            fg=self.COLORS.gray
         )
         history_label.grid(row=1, column=0, padx=20, pady=(20, 5), sticky="w")
         
         # Task history container
-        history_container = tk.Frame(self.sidebar_frame, bg=self.colors['sidebar_bg'])
+        history_container = tk.Frame(self.sidebar_frame, bg=self.COLORS.sidebar_bg)
         history_container.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nsew")
         history_container.grid_rowconfigure(0, weight=1)
         history_container.grid_columnconfigure(0, weight=1)
         
         # Scrollable task history
-        self.task_canvas = tk.Canvas(history_container, bg=self.colors['text_bg'], highlightthickness=0)
+        self.task_canvas = tk.Canvas(history_container, bg=self.COLORS.text_bg, highlightthickness=0)
         self.task_scrollbar = ttk.Scrollbar(history_container, orient="vertical", command=self.task_canvas.yview)
-        self.task_history_frame = tk.Frame(self.task_canvas, bg=self.colors['text_bg'])
+        self.task_history_frame = tk.Frame(self.task_canvas, bg=self.COLORS.text_bg)
         
-        self.task_canvas.configure(yscrollcommand=self.task_scrollbar.set)
+        self.task_canvas.configure(yscrollcommand=self._on_task_view_scrolled)
         self.task_canvas.grid(row=0, column=0, sticky="nsew")
         self.task_scrollbar.grid(row=0, column=1, sticky="ns")
         
@@ -166,108 +404,102 @@ class WindowsAgentGUI:
         self.task_history_frame.bind("<Configure>", self.on_task_frame_configure)
         self.task_canvas.bind("<Configure>", self.on_task_canvas_configure)
         
-        # Store selected task for highlighting
-        self.selected_task_widget = None
+        # Virtualized history rows: only the viewport's worth of Label
+        # widgets exist, recycled as the list scrolls. Pre-create enough
+        # rows for a full-height sidebar so refreshes never allocate
+        # widgets mid-scroll.
+        self._task_rows = []
+        self._task_display = []
+        self.selected_task_index = None
+        self._ensure_task_row_pool(self.TASK_ROW_POOL_SIZE)
+
+        # Debounce state for canvas resize events
+        self._resize_after = None
+        self._pending_canvas_width = 0
         
         # Control buttons at bottom
-        buttons_frame = tk.Frame(self.sidebar_frame, bg=self.colors['sidebar_bg'])
+        buttons_frame = tk.Frame(self.sidebar_frame, bg=self.COLORS.sidebar_bg)
         buttons_frame.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 20))
         buttons_frame.grid_columnconfigure(0, weight=1)
         
         # Start Task button
-        self.start_button = tk.Button(
+        self.start_button = ttk.Button(
             buttons_frame,
             text="▶ Start Task",
-            bg=self.colors['green'],
-            fg='white',
-            font=("Arial", 11, "bold"),
+            style='Green.TButton',
             command=self.start_task,
-            height=1,
-            relief='flat',
-            cursor='hand2',
-            pady=8
+            cursor='hand2'
         )
         self.start_button.grid(row=0, column=0, sticky="ew", pady=(0, 8))
-        
-        # Add hover effects for start button
-        self.start_button.bind("<Enter>", lambda e: self._on_button_enter(self.start_button, self.colors['green_hover']))
-        self.start_button.bind("<Leave>", lambda e: self._on_button_leave(self.start_button, self.colors['green']))
-        
+
         # Stop Task button
-        self.stop_button = tk.Button(
+        self.stop_button = ttk.Button(
             buttons_frame,
             text="⏹ Stop Task",
-            bg=self.colors['red'],
-            fg='white',
-            font=("Arial", 11, "bold"),
+            style='Red.TButton',
             command=self.stop_task,
-            height=1,
-            relief='flat',
             cursor='hand2',
-            state="disabled",
-            pady=8
+            state="disabled"
         )
         self.stop_button.grid(row=1, column=0, sticky="ew", pady=(0, 8))
-        
-        # Add hover effects for stop button
-        self.stop_button.bind("<Enter>", lambda e: self._on_button_enter(self.stop_button, self.colors['red_hover']))
-        self.stop_button.bind("<Leave>", lambda e: self._on_button_leave(self.stop_button, self.colors['red']))
-        
+
         # Settings button
-        self.settings_button = tk.Button(
+        self.settings_button = ttk.Button(
             buttons_frame,
             text="⚙ Settings",
-            bg=self.colors['gray'],
-            fg='white',
-            font=("Arial", 11, "bold"),
+            style='Gray.TButton',
             command=self.show_settings,
-            height=1,
-            relief='flat',
-            cursor='hand2',
-            pady=8
+            cursor='hand2'
         )
         self.settings_button.grid(row=2, column=0, sticky="ew")
-        
-        # Add hover effects for settings button
-        self.settings_button.bind("<Enter>", lambda e: self._on_button_enter(self.settings_button, self.colors['gray_hover']))
-        self.settings_button.bind("<Leave>", lambda e: self._on_button_leave(self.settings_button, self.colors['gray']))
     
     def on_task_frame_configure(self, event):
         """Update scroll region when task frame size changes."""
         self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all"))
     
     def on_task_canvas_configure(self, event):
-        """Update canvas window width when canvas size changes."""
-        canvas_width = event.width
-        self.task_canvas.itemconfig(self.task_canvas_window, width=canvas_width)
+        """Debounce canvas resizes so only the final width is applied.
+
+        Tk fires <Configure> for every pixel of a window drag; reflowing the
+        embedded frame each time causes a relayout storm, so wait for the
+        gesture to settle.
+        """
+        self._pending_canvas_width = event.width
+        if self._resize_after is not None:
+            self.root.after_cancel(self._resize_after)
+        self._resize_after = self.root.after(30, self._apply_canvas_width)
+
+    def _apply_canvas_width(self):
+        """Apply the most recent canvas width to the embedded history frame."""
+        self._resize_after = None
+        self.task_canvas.itemconfig(self.task_canvas_window, width=self._pending_canvas_width)
+        # A resize can change how many rows fit in the viewport
+        self._refresh_task_rows()
     
     def create_main_panel(self):
         """
         Create main content area with warning icon, command cards, and input field.
         """
         # Main panel frame
-        self.main_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        self.main_frame = tk.Frame(self.root, bg=self.COLORS.bg)
         self.main_frame.grid(row=0, column=1, sticky="nsew", padx=(2, 0))
         self.main_frame.grid_rowconfigure(1, weight=1)  # Command cards area expands
         self.main_frame.grid_columnconfigure(0, weight=1)
         
         # Command cards container
-        cards_container = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        cards_container = tk.Frame(self.main_frame, bg=self.COLORS.bg)
         cards_container.grid(row=0, column=0, padx=40, pady=(60, 40), sticky="nsew")
         cards_container.grid_columnconfigure(0, weight=1)
         cards_container.grid_columnconfigure(1, weight=1)
         cards_container.grid_columnconfigure(2, weight=1)
         
-        # Create three command cards
-        self.create_command_card(cards_container, 0, 0, "🔵", "Commands", 
-                               "Go to youtube and play song beat it.")
-        self.create_command_card(cards_container, 1, 0, "🟡", "Commands", 
-                               "Go to microsoft word and write a short 20 word summary on agi.")
-        self.create_command_card(cards_container, 2, 0, "🟠", "Commands", 
-                               "Go to microsoft copilot and ask what is agi.")
+        # Create the command cards from shared data; hover and click handlers
+        # are bound methods, so no per-card closures are allocated
+        for column, (icon, title, description) in enumerate(self.COMMAND_CARDS):
+            self._make_card(cards_container, column, icon, title, description)
         
         # Input section at bottom
-        input_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        input_frame = tk.Frame(self.main_frame, bg=self.COLORS.bg)
         input_frame.grid(row=1, column=0, padx=40, pady=(0, 40), sticky="ew")
         input_frame.grid_columnconfigure(0, weight=1)
         
@@ -275,9 +507,9 @@ class WindowsAgentGUI:
         self.command_entry = tk.Entry(
             input_frame,
             font=("Arial", 14),
-            bg=self.colors['entry_bg'],
-            fg=self.colors['fg'],
-            insertbackground=self.colors['fg'],
+            bg=self.COLORS.entry_bg,
+            fg=self.COLORS.fg,
+            insertbackground=self.COLORS.fg,
             relief='solid',
             borderwidth=1,
             highlightthickness=0
@@ -296,13 +528,13 @@ class WindowsAgentGUI:
             input_frame,
             text="AI agents can make mistakes. Check important info.",
             font=("Arial", 10),
-            bg=self.colors['bg'],
-            fg=self.colors['gray']
+            bg=self.COLORS.bg,
+            fg=self.COLORS.gray
         )
         disclaimer_label.grid(row=1, column=0, pady=(8, 0))
         
         # Main footer frame for branding
-        main_footer_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        main_footer_frame = tk.Frame(self.main_frame, bg=self.COLORS.bg)
         main_footer_frame.grid(row=2, column=0, padx=40, pady=(20, 20), sticky="ew")
         main_footer_frame.grid_columnconfigure(0, weight=1)
         
@@ -311,13 +543,13 @@ class WindowsAgentGUI:
             main_footer_frame,
             text="Luma – Windows Agent (Version 1.0)",
             font=("Arial", 11, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['fg']
+            bg=self.COLORS.bg,
+            fg=self.COLORS.fg
         )
         version_label.pack(pady=(0, 5))
         
         # Developer info frame to hold text and link inline
-        dev_info_frame = tk.Frame(main_footer_frame, bg=self.colors['bg'])
+        dev_info_frame = tk.Frame(main_footer_frame, bg=self.COLORS.bg)
         dev_info_frame.pack()
         
         # Developer text label
@@ -325,8 +557,8 @@ class WindowsAgentGUI:
             dev_info_frame,
             text="Luma is developed by Machovotrish. Learn more at ",
             font=("Arial", 10),
-            bg=self.colors['bg'],
-            fg=self.colors['gray']
+            bg=self.COLORS.bg,
+            fg=self.COLORS.gray
         )
         dev_text_label.pack(side="left")
         
@@ -335,8 +567,8 @@ class WindowsAgentGUI:
             dev_info_frame,
             text="www.machovotrish.com",
             font=("Arial", 10, "underline"),
-            bg=self.colors['bg'],
-            fg=self.colors['blue'],
+            bg=self.COLORS.bg,
+            fg=self.COLORS.blue,
             cursor='hand2'
         )
         link_label.pack(side="left")
@@ -345,8 +577,8 @@ class WindowsAgentGUI:
         link_label.bind("<Button-1>", self.open_machovotrish_link)
         
         # Add hover effects for the link
-        link_label.bind("<Enter>", lambda e: link_label.configure(fg=self.colors['blue_hover']))
-        link_label.bind("<Leave>", lambda e: link_label.configure(fg=self.colors['blue']))
+        link_label.bind("<Enter>", lambda e: link_label.configure(fg=self.COLORS.blue_hover))
+        link_label.bind("<Leave>", lambda e: link_label.configure(fg=self.COLORS.blue))
         
         # Create chat display for showing agent logs and messages
         self.chat_display = scrolledtext.ScrolledText(
@@ -354,90 +586,147 @@ class WindowsAgentGUI:
             wrap=tk.WORD,
             state=tk.DISABLED,
             font=("Consolas", 10),
-            bg=self.colors['text_bg'],
-            fg=self.colors['fg'],
+            bg=self.COLORS.text_bg,
+            fg=self.COLORS.fg,
             height=15
         )
         self.chat_display.grid(row=3, column=0, sticky="ew", pady=(10, 0))
+
+        # Message tags are configured once up front; inserts reference them
+        # by name so no per-message tag_config calls cross into Tcl
+        self.chat_display.tag_config('system', foreground=self.COLORS.gray)
+        self.chat_display.tag_config('error', foreground=self.COLORS.red)
+        self.chat_display.tag_config('agent', foreground=self.COLORS.fg)
+        self.chat_display.tag_config('user', foreground=self.COLORS.blue)
+
+        # Skip render work while the window is minimized or the user is
+        # reading scrollback; buffered output is flushed on restore
+        self._user_at_bottom = True
+        self._pending_display = []
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.chat_display.bind(sequence, self._on_chat_scrolled, add="+")
+        self.root.bind("<Map>", self._on_window_mapped, add="+")
     
-    def create_command_card(self, parent, column, row, icon, title, description):
+    def _make_card(self, parent, column, icon, title, description):
         """
         Create a command suggestion card with icon, title, and description.
         """
-        # Card frame
+        # Card frame; the description doubles as the command loaded on click
         card_frame = tk.Frame(
             parent,
-            bg=self.colors['card_bg'],
+            bg=self.COLORS.card_bg,
             relief='solid',
             borderwidth=1,
             cursor='hand2'
         )
-        card_frame.grid(row=row, column=column, padx=10, pady=10, sticky="nsew", ipadx=20, ipady=20)
-        
+        card_frame.grid(row=0, column=column, padx=10, pady=10, sticky="nsew", ipadx=20, ipady=20)
+        card_frame._card_text = description
+
         # Icon
         icon_label = tk.Label(
             card_frame,
             text=icon,
             font=("Arial", 24),
-            bg=self.colors['card_bg'],
-            fg=self.colors['fg']
+            bg=self.COLORS.card_bg,
+            fg=self.COLORS.fg
         )
         icon_label.pack(pady=(0, 10))
-        
+
         # Title
         title_label = tk.Label(
             card_frame,
             text=title,
             font=("Arial", 14, "bold"),
-            bg=self.colors['card_bg'],
-            fg=self.colors['fg']
+            bg=self.COLORS.card_bg,
+            fg=self.COLORS.fg
         )
         title_label.pack(pady=(0, 8))
-        
+
         # Description
         desc_label = tk.Label(
             card_frame,
             text=description,
             font=("Arial", 10),
-            bg=self.colors['card_bg'],
-            fg=self.colors['gray'],
+            bg=self.COLORS.card_bg,
+            fg=self.COLORS.gray,
             wraplength=200,
             justify='center'
         )
         desc_label.pack()
-        
-        # Bind click events to all card elements
-        def on_card_click(event=None):
-            self.load_previous_task(description)
-        
-        card_frame.bind("<Button-1>", on_card_click)
-        icon_label.bind("<Button-1>", on_card_click)
-        title_label.bind("<Button-1>", on_card_click)
-        desc_label.bind("<Button-1>", on_card_click)
-        
-        # Hover effects
-        def on_enter(event):
-            # Enhanced shadow pop effect
-            card_frame.configure(bg=self.colors['selected_bg'], relief='raised', borderwidth=2)
-            icon_label.configure(bg=self.colors['selected_bg'])
-            title_label.configure(bg=self.colors['selected_bg'])
-            desc_label.configure(bg=self.colors['selected_bg'])
-        
-        def on_leave(event):
-            # Restore original appearance
-            card_frame.configure(bg=self.colors['card_bg'], relief='solid', borderwidth=1)
-            icon_label.configure(bg=self.colors['card_bg'])
-            title_label.configure(bg=self.colors['card_bg'])
-            desc_label.configure(bg=self.colors['card_bg'])
-        
-        card_frame.bind("<Enter>", on_enter)
-        card_frame.bind("<Leave>", on_leave)
+
+        # Bind the shared handlers; the card frame is recovered from the
+        # event widget, so every card reuses the same bound methods
+        card_frame.bind("<Button-1>", self._on_card_click)
+        icon_label.bind("<Button-1>", self._on_card_click)
+        title_label.bind("<Button-1>", self._on_card_click)
+        desc_label.bind("<Button-1>", self._on_card_click)
+        card_frame.bind("<Enter>", self._on_card_enter)
+        card_frame.bind("<Leave>", self._on_card_leave)
+
+    @staticmethod
+    def _card_frame_for(widget):
+        """Resolve the card frame from whichever card widget got the event."""
+        return widget if hasattr(widget, '_card_text') else widget.master
+
+    def _on_card_click(self, event):
+        """Load the card's suggested command into the input field."""
+        self.load_previous_task(self._card_frame_for(event.widget)._card_text)
+
+    def _on_card_enter(self, event):
+        """Enhanced shadow pop effect on card hover."""
+        card_frame = self._card_frame_for(event.widget)
+        card_frame.configure(bg=self.COLORS.selected_bg, relief='raised', borderwidth=2)
+        for child in card_frame.winfo_children():
+            child.configure(bg=self.COLORS.selected_bg)
+
+    def _on_card_leave(self, event):
+        """Restore the card's original appearance."""
+        card_frame = self._card_frame_for(event.widget)
+        card_frame.configure(bg=self.COLORS.card_bg, relief='solid', borderwidth=1)
+        for child in card_frame.winfo_children():
+            child.configure(bg=self.COLORS.card_bg)
     
+    def _on_chat_scrolled(self, event=None):
+        """Re-check the scroll position once the wheel event has applied."""
+        self.root.after_idle(self._update_at_bottom)
+
+    def _update_at_bottom(self):
+        """Track whether the view is pinned to the end of the chat."""
+        self._user_at_bottom = self.chat_display.yview()[1] >= 0.999
+
+    def _on_window_mapped(self, event=None):
+        """Flush output buffered while the window was iconified."""
+        if event is not None and event.widget is not self.root:
+            return
+        if self._pending_display:
+            segments, self._pending_display = self._pending_display, []
+            self._display_chat_segments(segments)
+
+    def _display_chat_segments(self, segments):
+        """
+        Render alternating chars/tags segments into the chat display.
+
+        Nothing is inserted while the window is iconified — segments are
+        buffered and flushed on <Map> — and the auto-scroll is skipped when
+        the user has scrolled up to read.
+        """
+        if not segments:
+            return
+        if self.root.state() == 'iconic':
+            self._pending_display.extend(segments)
+            return
+
+        self.chat_display.configure(state=tk.NORMAL)
+        self.chat_display.insert(tk.END, *segments)
+        if self._user_at_bottom:
+            self.chat_display.see(tk.END)
+        self.chat_display.configure(state=tk.DISABLED)
+
     def clear_placeholder(self, event):
         """Clear placeholder text when entry gains focus."""
         if self.command_entry.get() == "Message Luma":
             self.command_entry.delete(0, tk.END)
-            self.command_entry.config(fg=self.colors['fg'])
+            self.command_entry.config(fg=self.COLORS.fg)
     
     def add_placeholder(self, event):
         """Add placeholder text when entry loses focus and is empty."""
@@ -463,7 +752,7 @@ class WindowsAgentGUI:
         self.settings_window = tk.Toplevel(self.root)
         self.settings_window.title("Agent Settings")
         self.settings_window.geometry("800x600")
-        self.settings_window.configure(bg=self.colors['bg'])
+        self.settings_window.configure(bg=self.COLORS.bg)
         self.settings_window.transient(self.root)
         self.settings_window.grab_set()
         
@@ -471,19 +760,19 @@ class WindowsAgentGUI:
         api_frame = tk.LabelFrame(
             self.settings_window, 
             text="API Configuration", 
-            bg=self.colors['bg'],
-            fg=self.colors['fg'],
+            bg=self.COLORS.bg,
+            fg=self.COLORS.fg,
             font=("Arial", 10, "bold")
         )
         api_frame.pack(fill="x", padx=20, pady=20)
         
-        tk.Label(api_frame, text="Google API Key:", bg=self.colors['bg'], fg=self.colors['fg']).pack(anchor="w", padx=10, pady=(10, 5))
+        tk.Label(api_frame, text="Google API Key:", bg=self.COLORS.bg, fg=self.COLORS.fg).pack(anchor="w", padx=10, pady=(10, 5))
         
         # API key input with show/hide toggle
-        key_frame = tk.Frame(api_frame, bg=self.colors['bg'])
+        key_frame = tk.Frame(api_frame, bg=self.COLORS.bg)
         key_frame.pack(fill="x", padx=10, pady=(0, 10))
         
-        self.api_key_entry = tk.Entry(key_frame, show="*", bg=self.colors['entry_bg'], fg=self.colors['fg'], insertbackground=self.colors['fg'])
+        self.api_key_entry = tk.Entry(key_frame, show="*", bg=self.COLORS.entry_bg, fg=self.COLORS.fg, insertbackground=self.COLORS.fg)
         self.api_key_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
         self.show_key_var = tk.BooleanVar()
@@ -492,29 +781,22 @@ class WindowsAgentGUI:
             text="Show", 
             variable=self.show_key_var,
             command=self.toggle_api_key_visibility,
-            bg=self.colors['bg'],
-            fg=self.colors['fg'],
-            selectcolor=self.colors['button_bg']
+            bg=self.COLORS.bg,
+            fg=self.COLORS.fg,
+            selectcolor=self.COLORS.button_bg
         )
         self.show_key_checkbox.pack(side="right")
         
         # Save API Key button
-        self.save_api_key_button = tk.Button(
+        self.save_api_key_button = ttk.Button(
             key_frame,
             text="Save API Key",
-            bg=self.colors['blue'],
-            fg='white',
-            font=("Arial", 9, "bold"),
+            style='Blue.TButton',
             command=self.save_api_key,
-            relief='flat',
             cursor='hand2'
         )
         self.save_api_key_button.pack(side="right", padx=(5, 0))
         
-        # Add hover effects for save API key button
-        self.save_api_key_button.bind("<Enter>", lambda e: self._on_button_enter(self.save_api_key_button, self.colors['blue_hover']))
-        self.save_api_key_button.bind("<Leave>", lambda e: self._on_button_leave(self.save_api_key_button, self.colors['blue']))
-        
         # Load current API key
         if self.current_api_key:
             self.api_key_entry.insert(0, self.current_api_key)
@@ -523,8 +805,8 @@ class WindowsAgentGUI:
         rules_frame = tk.LabelFrame(
             self.settings_window, 
             text="Agent Rules", 
-            bg=self.colors['bg'],
-            fg=self.colors['fg'],
+            bg=self.COLORS.bg,
+            fg=self.COLORS.fg,
             font=("Arial", 10, "bold")
         )
         rules_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -532,14 +814,14 @@ class WindowsAgentGUI:
         # Create 5 rule entry fields
         self.rule_entries = []
         for i in range(5):
-            rule_container = tk.Frame(rules_frame, bg=self.colors['bg'])
+            rule_container = tk.Frame(rules_frame, bg=self.COLORS.bg)
             rule_container.pack(fill="x", padx=10, pady=5)
             
             rule_label = tk.Label(
                 rule_container,
                 text=f"Rule {i+1}:",
-                bg=self.colors['bg'],
-                fg=self.colors['fg'],
+                bg=self.COLORS.bg,
+                fg=self.COLORS.fg,
                 font=("Arial", 10),
                 width=8,
                 anchor="w"
@@ -548,51 +830,43 @@ class WindowsAgentGUI:
             
             rule_entry = tk.Entry(
                 rule_container,
-                bg=self.colors['entry_bg'],
-                fg=self.colors['fg'],
-                insertbackground=self.colors['fg'],
+                bg=self.COLORS.entry_bg,
+                fg=self.COLORS.fg,
+                insertbackground=self.COLORS.fg,
                 font=("Arial", 10)
             )
             rule_entry.pack(side="left", fill="x", expand=True)
             self.rule_entries.append(rule_entry)
         
-        # Load current rules into entry fields
-        current_rules = self.load_rules()
+        # Load current rules into entry fields (cached in memory; rules.json
+        # is only read at startup and written on explicit save)
+        current_rules = self.settings.get("rules", [])
         for i, rule in enumerate(current_rules[:5]):  # Only load up to 5 rules
             if i < len(self.rule_entries):
                 self.rule_entries[i].insert(0, rule)
         
         # Save Rules button
-        save_rules_frame = tk.Frame(rules_frame, bg=self.colors['bg'])
+        save_rules_frame = tk.Frame(rules_frame, bg=self.COLORS.bg)
         save_rules_frame.pack(fill="x", padx=10, pady=(10, 10))
         
-        self.save_rules_button = tk.Button(
+        self.save_rules_button = ttk.Button(
             save_rules_frame,
             text="Save Rules",
-            bg=self.colors['green'],
-            fg='white',
-            font=("Arial", 10, "bold"),
+            style='Green.TButton',
             command=self.save_rules_from_settings_ui,
-            relief='flat',
             cursor='hand2'
         )
         self.save_rules_button.pack(side="right")
         
-        # Add hover effects for save rules button
-        self.save_rules_button.bind("<Enter>", lambda e: self._on_button_enter(self.save_rules_button, self.colors['green_hover']))
-        self.save_rules_button.bind("<Leave>", lambda e: self._on_button_leave(self.save_rules_button, self.colors['green']))
-        
         # Buttons frame
-        buttons_frame = tk.Frame(self.settings_window, bg=self.colors['bg'])
+        buttons_frame = tk.Frame(self.settings_window, bg=self.COLORS.bg)
         buttons_frame.pack(fill="x", padx=20, pady=(0, 20))
         
-        tk.Button(
-            buttons_frame, 
-            text="Cancel", 
-            bg=self.colors['gray'],
-            fg='white',
+        ttk.Button(
+            buttons_frame,
+            text="Cancel",
+            style='Gray.TButton',
             command=self.settings_window.destroy,
-            relief='flat',
             cursor='hand2'
         ).pack(side="right", padx=(5, 0))
     
@@ -603,16 +877,6 @@ class WindowsAgentGUI:
         else:
             self.api_key_entry.configure(show="*")
     
-    def _on_button_enter(self, button, hover_color):
-        """Handle button hover enter event with color transition."""
-        if button['state'] != 'disabled':
-            button.configure(bg=hover_color)
-    
-    def _on_button_leave(self, button, normal_color):
-        """Handle button hover leave event with color restoration."""
-        if button['state'] != 'disabled':
-            button.configure(bg=normal_color)
-    
     def save_api_key(self):
         """Save API key to .env file and reinitialize agent if needed."""
         try:
@@ -628,7 +892,7 @@ class WindowsAgentGUI:
                 self.add_message("System", "No API key provided.", "system")
             
             # Reinitialize agent with new settings
-            if DEPENDENCIES_AVAILABLE and self.current_api_key:
+            if self.current_api_key and dependencies_available():
                 self.initialize_agent()
             else:
                 self.add_message("System", "Agent will be initialized when you start a task.", "system")
@@ -636,42 +900,23 @@ class WindowsAgentGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save API key: {str(e)}")
     
-    def save_rules_to_env(self):
-        """Save rules to .env file."""
-        try:
-            # Get rules from entry fields
-            rules = []
-            for entry in self.rule_entries:
-                rule = entry.get().strip()
-                if rule and rule not in rules:  # Skip empty fields and prevent duplicates
-                    rules.append(rule)
-            
-            # Save rules to .env
-            self.save_rules(rules)
-            
-            # Update settings in memory
-            self.settings["rules"] = rules
-            
-            self.add_message("System", f"Saved {len(rules)} rules successfully.", "system")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save rules: {str(e)}")
-    
+    def _collect_rules_from_ui(self):
+        """Gather non-empty rules from the entry fields, deduped in order."""
+        return list(dict.fromkeys(
+            filter(None, (entry.get().strip() for entry in self.rule_entries))))
+
     def save_rules_from_settings_ui(self):
         """Save rules from settings UI to rules.json file."""
         try:
             # Get rules from entry fields
-            rules = []
-            for entry in self.rule_entries:
-                rule = entry.get().strip()
-                if rule and rule not in rules:  # Skip empty fields and prevent duplicates
-                    rules.append(rule)
-            
+            rules = self._collect_rules_from_ui()
+
             # Save rules to JSON file
             self._save_rules_to_file(rules)
             
             # Update settings in memory
             self.settings["rules"] = rules
+            self._rebuild_rules_prefix()
             
             self.add_message("System", f"Saved {len(rules)} rules successfully.", "system")
             
@@ -679,41 +924,45 @@ class WindowsAgentGUI:
             messagebox.showerror("Error", f"Failed to save rules: {str(e)}")
     
     def load_api_key_from_env(self):
-        """Load API key from .env file if it exists."""
-        try:
-            # Load environment variables from .env file
-            load_dotenv()
-            
-            # Get API key from environment
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if api_key:
-                self.current_api_key = api_key.strip()
-            else:
-                self.current_api_key = ""
-                
-        except Exception as e:
-            print(f"Error loading API key from .env: {e}")
-            self.current_api_key = ""
+        """Load API key from the environment (.env was loaded at import)."""
+        self.current_api_key = os.environ.get("GOOGLE_API_KEY", "").strip()
     
+    def _rebuild_rules_prefix(self):
+        """
+        Pre-render the rules preamble prepended to every task query.
+
+        Rules only change through the settings dialog, so the formatted
+        block is built once here instead of per task; an empty rule set
+        leaves the prefix as None and queries pass through untouched.
+        """
+        valid_rules = [rule.strip() for rule in self.settings.get("rules", []) if rule.strip()]
+        self._rules_count = len(valid_rules)
+        if valid_rules:
+            self._rules_prefix = (
+                "IMPORTANT: Follow these rules while completing the task:\n"
+                + "".join(f"{i}. {rule}\n" for i, rule in enumerate(valid_rules, 1))
+                + "\nNow complete this task: ")
+        else:
+            self._rules_prefix = None
+
     def load_rules(self) -> List[str]:
         """Load rules from rules.json file."""
         rules = []
         try:
             if os.path.exists('rules.json'):
                 with open('rules.json', 'r') as f:
-                    rules = json.load(f)
-                    # Ensure we have a list and filter out empty rules
-                    if isinstance(rules, list):
-                        rules = [rule.strip() for rule in rules if rule.strip()]
-                    else:
-                        rules = []
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading rules from rules.json: {e}")
-            rules = []
+                    raw = json.load(f)
+                # Ensure we have a list and filter out empty or non-string
+                # rules, stripping each entry exactly once
+                if isinstance(raw, list):
+                    for rule in raw:
+                        stripped = rule.strip() if isinstance(rule, str) else ''
+                        if stripped:
+                            rules.append(stripped)
         except Exception as e:
             print(f"Error loading rules from rules.json: {e}")
             rules = []
-        
+
         return rules
     
     def _save_rules_to_file(self, rules_list: List[str]):
@@ -731,13 +980,14 @@ class WindowsAgentGUI:
         """Save API key to .env file using python-dotenv."""
         try:
             from dotenv import set_key
-            
+
             # Use set_key to save API key to .env file
             set_key('.env', 'GOOGLE_API_KEY', api_key)
-            
-            # Reload environment variables to make the new key available immediately
-            load_dotenv(override=True)
-                
+
+            # Update the process environment directly; re-parsing the whole
+            # .env file with load_dotenv(override=True) would be redundant
+            os.environ['GOOGLE_API_KEY'] = api_key
+
         except Exception as e:
             print(f"Error saving API key to .env: {e}")
             raise
@@ -747,16 +997,26 @@ class WindowsAgentGUI:
         Initialize the agent with current settings (preserves original logic).
         """
         try:
-            if not DEPENDENCIES_AVAILABLE:
+            if not dependencies_available():
                 self.add_message("System", "Agent dependencies not available. Please install required packages.", "error")
                 return
-            
+
+            # First call pays the import; afterwards these hit sys.modules
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from windows_use.agent import Agent
+
             # Initialize LLM (original logic preserved)
             self.llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
             
             # Initialize Agent (original logic preserved)
             self.agent = Agent(llm=self.llm, browser='chrome', use_vision=True)
-            
+
+            # Route library log records directly into the message ring
+            if self._ring_handler is None:
+                self._ring_handler = _RingHandler(self._post_message)
+                for logger_name in ('windows_use', 'langchain'):
+                    logging.getLogger(logger_name).addHandler(self._ring_handler)
+
             self.add_message("System", "Agent initialized successfully.", "system")
             
         except Exception as e:
@@ -766,126 +1026,101 @@ class WindowsAgentGUI:
         """
         Capture agent output and send to GUI while preserving terminal output.
         """
-        # Create string buffer to capture output
-        captured_output = StringIO()
-        
         class TeeOutput:
-            def __init__(self, original, captured, message_queue, sender="Agent"):
+            def __init__(self, original, post, cancel_event, sender="Agent"):
                 self.original = original
-                self.captured = captured
-                self.message_queue = message_queue
+                self.post = post
+                self.cancel_event = cancel_event
                 self.sender = sender
-                self.buffer = ""
-            
+                # Partial-line fragments, joined only when a newline arrives
+                self._fragments = []
+
             def write(self, text):
+                # Cooperative cancellation: unwind the agent's frame at its
+                # next output once the user has asked to stop
+                if self.cancel_event.is_set():
+                    raise KeyboardInterrupt("task cancelled")
+
                 # Write to original (terminal)
                 self.original.write(text)
                 self.original.flush()
-                
-                # Write to captured buffer
-                self.captured.write(text)
-                
-                # Buffer text and send complete lines to GUI
-                self.buffer += text
-                while '\n' in self.buffer:
-                    line, self.buffer = self.buffer.split('\n', 1)
+
+                # Collect fragments until a newline shows up; a long token
+                # stream without newlines is O(1) appends rather than
+                # rebuilding one ever-growing buffer string per write
+                if '\n' not in text:
+                    self._fragments.append(text)
+                    return
+
+                self._fragments.append(text)
+                lines = "".join(self._fragments).split('\n')
+                self._fragments.clear()
+
+                # Last element is the unterminated remainder (may be empty)
+                remainder = lines.pop()
+                if remainder:
+                    self._fragments.append(remainder)
+
+                for line in lines:
                     if line.strip():  # Only send non-empty lines
                         # Format agent logs for better readability
-                        formatted_line = self.format_agent_log(line.strip())
+                        formatted_line = _format_agent_log(line)
                         if formatted_line:
-                            self.message_queue.put((self.sender, formatted_line, "agent"))
-            
+                            self.post(self.sender, formatted_line, "agent")
+
             def flush(self):
                 self.original.flush()
-                self.captured.flush()
                 # Send any remaining buffer content
-                if self.buffer.strip():
-                    formatted_line = self.format_agent_log(self.buffer.strip())
+                pending = "".join(self._fragments)
+                self._fragments.clear()
+                if pending.strip():
+                    formatted_line = _format_agent_log(pending)
                     if formatted_line:
-                        self.message_queue.put((self.sender, formatted_line, "agent"))
-                    self.buffer = ""
-            
-            def format_agent_log(self, line):
-                """Format agent log lines for better GUI display."""
-                line = line.strip()
-                if not line:
-                    return None
-                
-                # Add emojis and formatting for different log types
-                if "Iteration" in line:
-                    return f"🔄 {line}"
-                elif "Evaluate" in line:
-                    return f"🔍 {line}"
-                elif "Memory" in line:
-                    return f"🧠 {line}"
-                elif "Thought" in line:
-                    return f"💭 {line}"
-                elif "Action" in line:
-                    return f"⚡ {line}"
-                elif "Observation" in line:
-                    return f"👁️ {line}"
-                elif "Final Answer" in line:
-                    return f"✅ {line}"
-                elif "ERROR" in line.upper() or "EXCEPTION" in line.upper():
-                    return f"❌ {line}"
-                elif "WARNING" in line.upper():
-                    return f"⚠️ {line}"
-                else:
-                    # Return other agent output as-is
-                    return line
-        
-        # Set up output capture
-        tee_stdout = TeeOutput(self.original_stdout, captured_output, self.message_queue, "Agent")
-        tee_stderr = TeeOutput(self.original_stderr, captured_output, self.message_queue, "Agent")
+                        self.post(self.sender, formatted_line, "agent")
         
+        # Scoped redirection: print-based agent output still reaches the
+        # terminal and the GUI, but sys.stdout/sys.stderr are never
+        # reassigned globally (restoration is handled by the context managers)
+        tee_stdout = TeeOutput(sys.__stdout__, self._post_message, self._cancel_event, "Agent")
+        tee_stderr = TeeOutput(sys.__stderr__, self._post_message, self._cancel_event, "Agent")
+
         try:
-            # Redirect stdout and stderr to capture agent output
-            sys.stdout = tee_stdout
-            sys.stderr = tee_stderr
-            
-            # Execute the agent task
-            agent_result = self.agent.invoke(query)
-            
-            # Ensure any remaining output is flushed
-            sys.stdout.flush()
-            sys.stderr.flush()
-            
-            return agent_result
-            
-        finally:
-            # Always restore original stdout/stderr
-            sys.stdout = self.original_stdout
-            sys.stderr = self.original_stderr
+            with redirect_stdout(tee_stdout), redirect_stderr(tee_stderr):
+                # Execute the agent task
+                agent_result = self.agent.invoke(query)
+
+                # Ensure any remaining output is flushed
+                tee_stdout.flush()
+                tee_stderr.flush()
+        except KeyboardInterrupt:
+            # Raised by TeeOutput.write after stop_task; surface it to the
+            # awaiting coroutine as a normal cancellation
+            raise asyncio.CancelledError()
+
+        return agent_result
     
     def add_message(self, sender: str, message: str, msg_type: str = "user"):
         """
         Add message to chat display with proper formatting and auto-scroll.
         """
-        # Enable text widget for editing
-        self.chat_display.configure(state=tk.NORMAL)
-        
         # Format timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Insert formatted message
-        self.chat_display.insert(tk.END, f"[{timestamp}] {sender}: {message}\n\n")
-        
-        # Auto-scroll to bottom
-        self.chat_display.see(tk.END)
-        
-        # Disable editing
-        self.chat_display.configure(state=tk.DISABLED)
-        
+        timestamp = self._timestamp()
+
+        # Insert formatted message with its pre-configured style tag
+        self._display_chat_segments([f"[{timestamp}] {sender}: {message}\n\n", msg_type])
+
+
         # Save to chat history
-        self.chat_history.append({
+        entry = {
             "timestamp": timestamp,
             "sender": sender,
             "message": message,
             "type": msg_type
-        })
-        
-        # Save chat history to file
-        self.save_chat_history()
+        }
+        self.chat_history.append(entry)
+
+        # Append the new entry to the on-disk log
+        self._append_history_line(self._chat_file, entry)
     
     def send_command(self, event=None):
         """
@@ -910,111 +1145,88 @@ class WindowsAgentGUI:
         self.add_message("User", command, "user")
         
         # Check if agent is available
-        if not DEPENDENCIES_AVAILABLE:
+        if not dependencies_available():
             self.add_message("System", "Please install required dependencies: langchain-google-genai, windows-use", "error")
             return
         
         # Add to task history
         self.task_history.append(command)
+        self._append_history_line(self._task_file, command)
         self.update_task_history_display()
         
-        # Execute command in separate thread to prevent GUI blocking
+        # Dispatch onto the persistent event loop to prevent GUI blocking
         if not self.is_task_running:
-            # CHANGE: Use asyncio for better task cancellation support
-            self.task_thread = threading.Thread(target=self.run_agent_task_async, args=(command,))
-            self.task_thread.daemon = True
-            self.task_thread.start()
-    
-    def run_agent_task_async(self, query: str):
+            self.current_task = asyncio.run_coroutine_threadsafe(
+                self.execute_agent_task_async(command), self._loop)
+            self.current_task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, future):
         """
-        Run agent task in asyncio event loop for better cancellation support.
+        Report task completion, cancellation, or failure back to the GUI.
         """
-        # Create new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
-            # CHANGE: Create cancellable task
-            self.current_task = loop.create_task(self.execute_agent_task_async(query))
-            loop.run_until_complete(self.current_task)
+            future.result()
         except asyncio.CancelledError:
-            self.message_queue.put(("System", "Task was cancelled by user.", "system"))
+            self._post_message("System", "Task was cancelled by user.", "system")
         except Exception as e:
-            self.message_queue.put(("System", f"Error in task execution: {str(e)}", "error"))
+            self._post_message("System", f"Error in task execution: {str(e)}", "error")
         finally:
-            loop.close()
             self.current_task = None
-            # Add confirmation message after thread cleanup
+            # Add confirmation message after task cleanup
             if not self.is_task_running:
-                self.message_queue.put(("System", "✋ Task stopped successfully.", "system"))
+                self._post_message("System", "✋ Task stopped successfully.", "system")
     
     async def execute_agent_task_async(self, query: str):
         """
         Execute agent task asynchronously with progress streaming.
         """
         self.is_task_running = True
-        self.message_queue.put(("update_buttons", "", ""))
+        self._cancel_event.clear()
+        self._post_message("update_buttons", "", "")
         
         # Add status message
-        self.message_queue.put(("Agent", "🤖 Initializing task...", "agent"))
+        self._post_message("Agent", "🤖 Initializing task...", "agent")
         
         # CHANGE: Stream progress updates to GUI
-        self.message_queue.put(("Agent", f"📋 Objective: {query}", "agent"))
+        self._post_message("Agent", f"📋 Objective: {query}", "agent")
         
-        # Load and apply rules to the query
-        rules = self.settings.get("rules", [])
-        enhanced_query = query
-        
-        if rules:
-            # Filter out empty rules
-            valid_rules = [rule.strip() for rule in rules if rule.strip()]
-            if valid_rules:
-                self.message_queue.put(("Agent", f"📋 Applying {len(valid_rules)} rules to guide task execution...", "agent"))
-                
-                # Format rules as clear instructions
-                rules_text = "IMPORTANT: Follow these rules while completing the task:\n"
-                for i, rule in enumerate(valid_rules, 1):
-                    rules_text += f"{i}. {rule}\n"
-                rules_text += f"\nNow complete this task: {query}"
-                enhanced_query = rules_text
-        
-        # Check for cancellation
-        if asyncio.current_task().cancelled():
-            raise asyncio.CancelledError()
+        # Apply the pre-rendered rules preamble; it is rebuilt only when
+        # rules actually change, not once per task
+        if self._rules_prefix:
+            self._post_message("Agent", f"📋 Applying {self._rules_count} rules to guide task execution...", "agent")
+            enhanced_query = self._rules_prefix + query
+        else:
+            enhanced_query = query
         
-        self.message_queue.put(("Agent", "🔍 Analyzing request and planning actions...", "agent"))
+        self._post_message("Agent", "🔍 Analyzing request and planning actions...", "agent")
         
         # Execute agent query with progress streaming
         try:
-            # Run the agent invoke in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                self.message_queue.put(("Agent", "⚡ Executing agent task...", "agent"))
-                
-                # Check for cancellation before long operation
-                if asyncio.current_task().cancelled():
-                    raise asyncio.CancelledError()
-                
-                # Execute the actual agent task with output capture and rules
-                agent_result = await loop.run_in_executor(executor, self.capture_agent_output, enhanced_query)
-                
-                # Check for cancellation after operation
-                if asyncio.current_task().cancelled():
-                    raise asyncio.CancelledError()
-                
-                # Display final result
-                self.message_queue.put(("Agent", "✅ Task completed successfully!", "agent"))
-                if hasattr(agent_result, 'content') and agent_result.content:
-                    self.message_queue.put(("Agent", f"📄 Final Result: {agent_result.content}", "agent"))
-                
+            # Run the agent invoke in the pooled executor to avoid blocking
+            loop = asyncio.get_running_loop()
+
+            self._post_message("Agent", "⚡ Executing agent task...", "agent")
+
+            # Execute the actual agent task with output capture and rules;
+            # cancellation arrives either through the awaited future or as
+            # CancelledError raised out of the worker via the cancel event
+            agent_result = await loop.run_in_executor(
+                self._agent_executor, self.capture_agent_output, enhanced_query)
+
+            # Display final result
+            self._post_message("Agent", "✅ Task completed successfully!", "agent")
+            content = getattr(agent_result, 'content', None)
+            if content:
+                self._post_message("Agent", f"📄 Final Result: {content}", "agent")
+
         except asyncio.CancelledError:
             # Re-raise cancellation to be handled by caller
             raise
         except Exception as e:
-            self.message_queue.put(("System", f"❌ Error executing task: {str(e)}", "error"))
+            self._post_message("System", f"❌ Error executing task: {str(e)}", "error")
         finally:
             self.is_task_running = False
-            self.message_queue.put(("update_buttons", "", ""))
+            self._post_message("update_buttons", "", "")
     
     def start_task(self):
         """Handle start task button click."""
@@ -1030,7 +1242,7 @@ class WindowsAgentGUI:
             return
         
         # Initialize agent if not already initialized
-        if not self.agent and DEPENDENCIES_AVAILABLE:
+        if not self.agent and dependencies_available():
             try:
                 self.initialize_agent()
             except Exception as e:
@@ -1047,11 +1259,13 @@ class WindowsAgentGUI:
     
     def stop_task(self):
         """CHANGE: Implement functional stop task with proper cancellation."""
-        if self.is_task_running and self.task_thread:
+        if self.is_task_running and self.current_task:
             self.add_message("System", "🛑 Stopping task... Please wait...", "system")
-            
-            # Cancel the asyncio task if it exists
-            if self.current_task and not self.current_task.done():
+
+            # Ask the worker to unwind at its next output, and cancel the
+            # coroutine in case it is still awaiting
+            self._cancel_event.set()
+            if not self.current_task.done():
                 self.current_task.cancel()
             
             # Reset state
@@ -1067,90 +1281,177 @@ class WindowsAgentGUI:
             self.start_button.configure(state="normal")
             self.stop_button.configure(state="disabled")
     
+    # Fixed pixel height of one virtualized task-history row, and the number
+    # of pooled rows created up front (enough for a full-height sidebar)
+    TASK_ROW_HEIGHT = 34
+    TASK_ROW_POOL_SIZE = 24
+
     def update_task_history_display(self):
         """Update the task history display in sidebar with proper styling."""
-        # Clear existing history items
-        for widget in self.task_history_frame.winfo_children():
-            widget.destroy()
-        
-        # Reset selected task widget
-        self.selected_task_widget = None
-        
-        # Add recent tasks (last 8 to fit better)
-        recent_tasks = self.task_history[-8:] if len(self.task_history) > 8 else self.task_history
-        
-        for i, task in enumerate(reversed(recent_tasks)):
-            task_text = task[:40] + "..." if len(task) > 40 else task
-            
-            task_label = tk.Label(
+        # Most recent tasks first; only the rows inside the canvas viewport
+        # are backed by real widgets, so the full history can be kept
+        self._task_display = list(reversed(self.task_history))
+        self.selected_task_index = None
+
+        total_height = len(self._task_display) * self.TASK_ROW_HEIGHT
+        self.task_history_frame.configure(height=max(total_height, 1))
+        self.task_canvas.configure(scrollregion=(0, 0, 0, total_height))
+        self._refresh_task_rows()
+
+    def _ensure_task_row_pool(self, count):
+        """Grow the recycled row pool to hold `count` labels, binding once."""
+        while len(self._task_rows) < count:
+            row = tk.Label(
                 self.task_history_frame,
-                text=task_text,
                 font=("Arial", 11),
-                bg=self.colors['sidebar_bg'],
-                fg=self.colors['fg'],
+                bg=self.COLORS.sidebar_bg,
+                fg=self.COLORS.fg,
                 anchor='w',
                 cursor='hand2',
-                padx=10,
-                pady=8
+                padx=10
             )
-            task_label.pack(fill="x", pady=2)
-            
-            # Bind click event
-            task_label.bind("<Button-1>", lambda e, t=task, widget=task_label: self.on_history_select(t, widget))
-            
-            # Hover effects
-            def on_enter(event, widget=task_label):
-                if widget != self.selected_task_widget:
-                    widget.configure(bg=self.colors['button_bg'])
-            
-            def on_leave(event, widget=task_label):
-                if widget != self.selected_task_widget:
-                    widget.configure(bg=self.colors['sidebar_bg'])
-            
-            task_label.bind("<Enter>", on_enter)
-            task_label.bind("<Leave>", on_leave)
-        
-        # Update scroll region
-        self.task_history_frame.update_idletasks()
-        self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all"))
-    
-    def on_history_select(self, task, widget):
+            row._task_index = -1
+            row.bind("<Button-1>", self._on_task_row_click)
+            row.bind("<Enter>", self._on_task_row_enter)
+            row.bind("<Leave>", self._on_task_row_leave)
+            self._task_rows.append(row)
+
+    def _refresh_task_rows(self):
+        """Re-map the pooled row widgets onto the currently visible slice."""
+        total = len(self._task_display)
+        row_h = self.TASK_ROW_HEIGHT
+
+        # Two spare rows cover partially visible entries at both edges
+        visible = self.task_canvas.winfo_height() // row_h + 2
+        first = max(0, int(self.task_canvas.canvasy(0)) // row_h)
+
+        self._ensure_task_row_pool(min(visible, total))
+
+        for i, row in enumerate(self._task_rows):
+            index = first + i
+            if i < visible and index < total:
+                task = self._task_display[index]
+                task_text = task[:40] + "..." if len(task) > 40 else task
+                selected = index == self.selected_task_index
+                row._task_index = index
+                row.configure(
+                    text=task_text,
+                    bg=self.COLORS.selected_bg if selected else self.COLORS.sidebar_bg
+                )
+                row.place(x=0, y=index * row_h, relwidth=1, height=row_h)
+            else:
+                row._task_index = -1
+                row.place_forget()
+
+    def _on_task_view_scrolled(self, first, last):
+        """Keep the scrollbar in sync and re-map rows after any view change."""
+        self.task_scrollbar.set(first, last)
+        self._refresh_task_rows()
+
+    def _on_task_row_click(self, event):
+        """Handle clicks on a pooled history row."""
+        index = event.widget._task_index
+        if 0 <= index < len(self._task_display):
+            self.on_history_select(index)
+
+    def _on_task_row_enter(self, event):
+        """Hover highlight for unselected history rows."""
+        if event.widget._task_index != self.selected_task_index:
+            event.widget.configure(bg=self.COLORS.button_bg)
+
+    def _on_task_row_leave(self, event):
+        """Restore background when the pointer leaves a history row."""
+        if event.widget._task_index != self.selected_task_index:
+            event.widget.configure(bg=self.COLORS.sidebar_bg)
+
+    def on_history_select(self, index):
         """Handle task history item selection with visual feedback."""
-        # Unhighlight previous selection
-        if self.selected_task_widget:
-            self.selected_task_widget.configure(bg=self.colors['sidebar_bg'])
-        
-        # Highlight current selection
-        widget.configure(bg=self.colors['selected_bg'])
-        self.selected_task_widget = widget
-        
+        self.selected_task_index = index
+        self._refresh_task_rows()
+
         # Load the task
-        self.load_previous_task(task)
+        self.load_previous_task(self._task_display[index])
     
     def load_previous_task(self, task: str):
         """Load a previous task into the input field."""
         self.command_entry.delete(0, tk.END)
         self.command_entry.insert(0, task)
-        self.command_entry.config(fg=self.colors['fg'])
+        self.command_entry.config(fg=self.COLORS.fg)
     
+    # Maximum messages drained per poll so a flooding producer cannot
+    # starve the rest of the UI.
+    MAX_DRAIN = 512
+
+    def _post_message(self, sender, message, msg_type):
+        """
+        Producer-side enqueue, callable from any thread.
+
+        The Tk consumer is woken with a virtual event only on the
+        empty-to-non-empty transition, so a burst of messages coalesces
+        into a single drain instead of a poll firing forever.
+        """
+        self.message_queue.push((sender, message, msg_type))
+        if not self._drain_pending:
+            self._drain_pending = True
+            try:
+                # event_generate is thread-safe on Tk 8.6+
+                self.root.event_generate("<<AgentLog>>", when="tail")
+            except tk.TclError:
+                # Window is being torn down; clear the guard so a later
+                # post can retry rather than waiting on a lost wakeup
+                self._drain_pending = False
+
+    def _on_agent_log_event(self, event=None):
+        """Coalesce wakeup events into one drain on the next idle moment."""
+        self.root.after_idle(self.process_message_queue)
+
     def process_message_queue(self):
         """
         Process messages from background threads safely in main thread.
+
+        Pending messages are drained as a batch and written to the chat
+        display with a single insert, so a chatty agent costs one Tk
+        text-widget relayout per drain instead of one per log line.
         """
-        try:
-            while True:
-                sender, message, msg_type = self.message_queue.get_nowait()
-                
-                if sender == "update_buttons":
-                    self.update_button_states()
-                else:
-                    self.add_message(sender, message, msg_type)
-                    
-        except queue.Empty:
-            pass
-        
-        # Schedule next check
-        self.root.after(100, self.process_message_queue)
+        self._drain_pending = False
+        batch = []
+        while len(batch) < self.MAX_DRAIN:
+            item = self.message_queue.pop()
+            if item is None:
+                break
+            sender, message, msg_type = item
+
+            if sender == "update_buttons":
+                self.update_button_states()
+            else:
+                batch.append(item)
+
+        if batch:
+            timestamp = self._timestamp()
+
+            # Text.insert accepts alternating chars/tags arguments, so the
+            # whole batch lands in one call with per-message styling
+            segments = []
+            entries = []
+            for sender, message, msg_type in batch:
+                segments.append(f"[{timestamp}] {sender}: {message}\n\n")
+                segments.append(msg_type)
+                entries.append({
+                    "timestamp": timestamp,
+                    "sender": sender,
+                    "message": message,
+                    "type": msg_type
+                })
+
+            self.chat_history.extend(entries)
+            self._append_history_batch(self._chat_file, entries)
+            self._display_chat_segments(segments)
+
+        # Come back for the remainder if the drain cap was hit; a timer
+        # rather than after_idle so redraws and input get a turn between
+        # capped drains during a sustained flood
+        if len(self.message_queue):
+            self.root.after(1, self.process_message_queue)
     
     def load_settings(self) -> Dict[str, Any]:
         """Load application settings from file."""
@@ -1174,75 +1475,152 @@ class WindowsAgentGUI:
         return default_settings
     
     def save_settings_to_file(self):
-        """Save current settings to file."""
+        """Save current settings to file, swapping the new file in atomically."""
         try:
-            with open("agent_settings.json", 'w') as f:
+            with open("agent_settings.json.tmp", 'w') as f:
                 json.dump(self.settings, f, indent=2)
+            os.replace("agent_settings.json.tmp", "agent_settings.json")
         except Exception as e:
             print(f"Error saving settings: {e}")
     
+    def _timestamp(self):
+        """HH:MM:SS for the current second, memoized at 1s resolution."""
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._ts_str
+
+    def _flush_history_logs(self):
+        """Debounced flush of the buffered history logs."""
+        try:
+            self._chat_file.flush()
+            self._task_file.flush()
+        except ValueError:
+            return  # Logs already closed during shutdown
+        self.root.after(self.HISTORY_FLUSH_MS, self._flush_history_logs)
+
+    def _append_history_line(self, fp, entry):
+        """Append one JSONL record; the write is O(entry), not O(history)."""
+        try:
+            fp.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except Exception as e:
+            print(f"Error appending history entry: {e}")
+
+    def _append_history_batch(self, fp, entries):
+        """Append a drained batch of JSONL records with a single write."""
+        try:
+            fp.write("".join(
+                json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries))
+        except Exception as e:
+            print(f"Error appending history batch: {e}")
+
+    def _read_history_log(self, jsonl_file, legacy_file, max_entries):
+        """
+        Read a JSONL history log, falling back to the legacy JSON file.
+
+        The log is capped to the newest max_entries; corrupt lines (e.g. a
+        truncated final record after a crash) are skipped.
+        """
+        entries = []
+        try:
+            if os.path.exists(jsonl_file):
+                with open(jsonl_file, 'r', encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            try:
+                                entries.append(json.loads(line))
+                            except json.JSONDecodeError:
+                                continue
+            elif os.path.exists(legacy_file):
+                with open(legacy_file, 'r') as f:
+                    entries = json.load(f)
+        except Exception as e:
+            print(f"Error loading history from {jsonl_file}: {e}")
+
+        return entries[-max_entries:] if len(entries) > max_entries else entries
+
+    def _write_history_log(self, jsonl_file, entries):
+        """
+        Rewrite a history log from memory, compacting the append-only file.
+
+        The log is written to a sibling tempfile and swapped in with
+        os.replace, so a crash mid-write leaves the old file intact
+        instead of a truncated one.
+        """
+        tmp_file = jsonl_file + ".tmp"
+        try:
+            if orjson is not None:
+                with open(tmp_file, 'wb') as f:
+                    f.write(b"".join(
+                        orjson.dumps(entry) + b"\n" for entry in entries))
+            else:
+                with open(tmp_file, 'w', encoding="utf-8") as f:
+                    for entry in entries:
+                        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            os.replace(tmp_file, jsonl_file)
+        except Exception as e:
+            print(f"Error saving history to {jsonl_file}: {e}")
+
     def load_chat_history(self):
         """Load chat history from file."""
-        history_file = "chat_history.json"
         try:
-            if os.path.exists(history_file):
-                with open(history_file, 'r') as f:
-                    self.chat_history = json.load(f)
-                
-                # Display recent chat history (last 20 messages)
-                recent_history = self.chat_history[-20:] if len(self.chat_history) > 20 else self.chat_history
-                
-                for msg in recent_history:
-                    self.chat_display.configure(state=tk.NORMAL)
-                    self.chat_display.insert(tk.END, f"[{msg['timestamp']}] {msg['sender']}: {msg['message']}\n\n")
-                    self.chat_display.configure(state=tk.DISABLED)
-                
-                if recent_history:
-                    self.chat_display.see(tk.END)
-                    
+            self.chat_history = deque(
+                self._read_history_log(
+                    self.CHAT_HISTORY_FILE, "chat_history.json", self.MAX_CHAT_LOG_ENTRIES),
+                maxlen=self.MAX_CHAT_LOG_ENTRIES)
+
+            # Display recent chat history (last 20 messages) in one insert
+            segments = []
+            for msg in list(self.chat_history)[-20:]:
+                segments.append(f"[{msg['timestamp']}] {msg['sender']}: {msg['message']}\n\n")
+                segments.append(msg.get('type', 'agent'))
+            self._display_chat_segments(segments)
+
         except Exception as e:
             print(f"Error loading chat history: {e}")
-    
+
     def save_chat_history(self):
         """Save chat history to file."""
-        try:
-            with open("chat_history.json", 'w') as f:
-                json.dump(self.chat_history, f, indent=2)
-        except Exception as e:
-            print(f"Error saving chat history: {e}")
-    
+        self._write_history_log(self.CHAT_HISTORY_FILE, self.chat_history)
+
     def load_task_history(self):
         """Load task history from file."""
-        history_file = "task_history.json"
         try:
-            if os.path.exists(history_file):
-                with open(history_file, 'r') as f:
-                    self.task_history = json.load(f)
+            self.task_history = deque(
+                self._read_history_log(
+                    self.TASK_HISTORY_FILE, "task_history.json", self.MAX_TASK_LOG_ENTRIES),
+                maxlen=self.MAX_TASK_LOG_ENTRIES)
+            if self.task_history:
                 self.update_task_history_display()
         except Exception as e:
             print(f"Error loading task history: {e}")
-    
+
     def save_task_history(self):
         """Save task history to file."""
-        try:
-            with open("task_history.json", 'w') as f:
-                json.dump(self.task_history, f, indent=2)
-        except Exception as e:
-            print(f"Error saving task history: {e}")
+        self._write_history_log(self.TASK_HISTORY_FILE, self.task_history)
     
     def open_machovotrish_link(self, event=None):
         """Open Machovotrish website in default browser."""
         try:
-            webbrowser.open_new_tab("https://www.machovotrish.com")
+            if sys.platform == 'win32':
+                # ShellExecute directly; webbrowser re-resolves the default
+                # browser from the registry on every call
+                os.startfile(self.MACHOVOTRISH_URL)
+            else:
+                webbrowser.open_new_tab(self.MACHOVOTRISH_URL)
         except Exception as e:
             # Fallback: show message box with URL if browser opening fails
-            messagebox.showinfo("Website Link", "Visit: https://www.machovotrish.com")
+            messagebox.showinfo("Website Link", f"Visit: {self.MACHOVOTRISH_URL}")
             print(f"Error opening browser: {e}")
     
     def on_closing(self):
         """Handle application closing with cleanup."""
         try:
-            # Save all data before closing
+            # Compact the append-only logs to their capped in-memory state
+            self._chat_file.close()
+            self._task_file.close()
             self.save_chat_history()
             self.save_task_history()
             self.save_settings_to_file()
@@ -1250,7 +1628,11 @@ class WindowsAgentGUI:
             # Stop any running tasks
             if self.is_task_running:
                 self.is_task_running = False
-            
+
+            # Shut down the agent worker and the background event loop
+            self._agent_executor.shutdown(wait=False)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
             # Close application
             self.root.destroy()
             
@@ -1268,28 +1650,28 @@ def main():
     Main entry point - launches GUI application instead of terminal interface.
     """
     try:
-        # Check if dependencies are available
-        if not DEPENDENCIES_AVAILABLE:
-            print("Warning: Some dependencies are missing. GUI will start but agent functionality may be limited.")
-            print("Please install: pip install langchain-google-genai windows-use python-dotenv")
-        
-        # Create and run GUI application
+        # Create and run GUI application; agent dependencies are probed
+        # lazily on first use rather than delaying the window here
         app = WindowsAgentGUI()
         app.run()
-        
+
     except Exception as e:
         print(f"Failed to start GUI application: {e}")
         # Fallback to original terminal interface if GUI fails
-        if DEPENDENCIES_AVAILABLE:
+        if dependencies_available():
             print("Falling back to terminal interface...")
-            
-            load_dotenv()
+
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from windows_use.agent import Agent
+
             llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
             agent = Agent(llm=llm, browser='chrome', use_vision=True)
-            
+
             query = input("Enter your query: ")
             agent_result = agent.invoke(query=query)
             print(agent_result.content)
+        else:
+            print("Please install: pip install langchain-google-genai windows-use python-dotenv")
 
 
 if __name__ == "__main__":